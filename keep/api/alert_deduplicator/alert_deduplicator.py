@@ -29,6 +29,24 @@ from keep.providers.providers_factory import ProvidersFactory
 DEFAULT_RULE_UUID = "00000000-0000-0000-0000-000000000000"
 
 
+def _canonical_hash(payload: dict) -> str:
+    """
+    Hash a payload over a canonical JSON serialization.
+
+    Keys are sorted so the hash is independent of dict ordering, and the
+    compact separators avoid serializing (and hashing) whitespace.
+
+    Collision resistance is all this needs, not cryptographic strength, but
+    sha256 is kept deliberately: it is hardware-accelerated through OpenSSL,
+    the serialization above dominates the cost anyway, and swapping the
+    algorithm would invalidate every stored alert_hash, causing a one-time
+    dedup miss per fingerprint on upgrade for no measurable gain.
+    """
+    return hashlib.sha256(
+        json.dumps(payload, default=str, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
 class AlertDeduplicator:
 
     DEDUPLICATION_DISTRIBUTION_ENABLED = config(
@@ -47,6 +65,7 @@ class AlertDeduplicator:
         alert: AlertDto,
         rule: DeduplicationRuleDto,
         last_alert_fingerprint_to_hash: dict[str, str] | None = None,
+        alert_dict: dict | None = None,
     ) -> bool:
         """
         Apply a deduplication rule to an alert.
@@ -56,17 +75,20 @@ class AlertDeduplicator:
         - calculating the hash
         - checking if the hash is already in the database
         - setting the isFullDuplicate or isPartialDuplicate flag
+
+        The serialized alert is computed once per alert (by apply_deduplication)
+        and shared across the rules; only the dicts along an ignored field's
+        path are copied, never the whole alert.
         """
-        # we don't want to remove fields from the original alert
-        alert_copy = copy.deepcopy(alert)
+        if alert_dict is None:
+            alert_dict = alert.dict()
+        event = alert_dict
         # remove the fields that should be ignored
         for field in rule.ignore_fields:
-            alert_copy = self._remove_field(field, alert_copy)
+            event = self._remove_event_field(event, field)
 
         # calculate the hash
-        alert_hash = hashlib.sha256(
-            json.dumps(alert_copy.dict(), default=str, sort_keys=True).encode()
-        ).hexdigest()
+        alert_hash = _canonical_hash(event)
         alert.alert_hash = alert_hash
         # Check if the hash is already in the database.
         # If last_alert_fingerprint_to_hash is provided, use it
@@ -130,6 +152,10 @@ class AlertDeduplicator:
             self.tenant_id, alert.providerId, alert.providerType
         )
 
+        # serialize the alert once and share it between the rules - each rule
+        # only diverges from it where its ignore_fields apply
+        alert_dict = alert.dict()
+
         for rule in rules:
             self.logger.debug(
                 "Applying deduplication rule to alert",
@@ -139,7 +165,7 @@ class AlertDeduplicator:
                 },
             )
             alert = self._apply_deduplication_rule(
-                alert, rule, last_alert_fingerprint_to_hash
+                alert, rule, last_alert_fingerprint_to_hash, alert_dict
             )
             self.logger.debug(
                 "Alert after deduplication rule applied",
@@ -177,22 +203,21 @@ class AlertDeduplicator:
 
         return alert
 
-    def _remove_field(self, field, alert: AlertDto) -> AlertDto:
-        alert = copy.deepcopy(alert)
+    def _remove_event_field(self, event: dict, field: str) -> dict:
+        # remove a (possibly dot-notated) field from the serialized alert,
+        # copying only the dicts along the path so the shared alert dict is
+        # never mutated
         field_parts = field.split(".")
-        if len(field_parts) == 1:
-            try:
-                delattr(alert, field)
-            except AttributeError:
-                self.logger.warning(f"Failed to delete attribute {field} from alert")
-        else:
-            alert_attr = field_parts[0]
-            d = copy.deepcopy(getattr(alert, alert_attr))
-            for part in field_parts[1:-1]:
+        event = dict(event)
+        d = event
+        try:
+            for part in field_parts[:-1]:
+                d[part] = dict(d[part])
                 d = d[part]
             del d[field_parts[-1]]
-            setattr(alert, field_parts[0], d)
-        return alert
+        except (KeyError, TypeError):
+            self.logger.warning(f"Failed to delete field {field} from alert")
+        return event
 
     def get_deduplication_rules(
         self, tenant_id, provider_id, provider_type
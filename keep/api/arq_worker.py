@@ -22,7 +22,7 @@ from keep.api.consts import (
 )
 from keep.api.core.config import config
 from keep.api.redis_settings import get_redis_settings
-from keep.api.tasks.process_event_task import process_event
+from keep.api.tasks.process_event_task import process_event, process_event_bulk
 
 # Load environment variables
 load_dotenv(find_dotenv())
@@ -121,6 +121,62 @@ async def process_event_in_worker(
 FUNCTIONS.append(process_event_in_worker)
 
 
+async def process_event_bulk_in_worker(
+    ctx,
+    tenant_id,
+    provider_type,
+    provider_id,
+    fingerprint,
+    api_key_name,
+    trace_id,
+    events,
+    notify_client=True,
+    timestamp_forced=None,
+):
+    logger.info(
+        "Processing event batch in worker",
+        extra={
+            "tenant_id": tenant_id,
+            "provider_type": provider_type,
+            "provider_id": provider_id,
+            "fingerprint": fingerprint,
+            "tract_id": trace_id,
+            "batch_size": len(events),
+        },
+    )
+    # Create a new context that includes both the arq ctx and any other parameters
+    process_event_bulk_func_sync = functools.partial(
+        process_event_bulk,
+        ctx=ctx,  # Pass ctx as a named parameter
+        tenant_id=tenant_id,
+        provider_type=provider_type,
+        provider_id=provider_id,
+        fingerprint=fingerprint,
+        api_key_name=api_key_name,
+        trace_id=trace_id,
+        events=events,
+        notify_client=notify_client,
+        timestamp_forced=timestamp_forced,
+    )
+    loop = asyncio.get_running_loop()
+    # run the function in the thread pool
+    resp = await loop.run_in_executor(ctx["pool"], process_event_bulk_func_sync)
+    logger.info(
+        "Event batch processed in worker",
+        extra={
+            "tenant_id": tenant_id,
+            "provider_type": provider_type,
+            "provider_id": provider_id,
+            "fingerprint": fingerprint,
+            "tract_id": trace_id,
+        },
+    )
+    return resp
+
+
+FUNCTIONS.append(process_event_bulk_in_worker)
+
+
 
 async def startup(ctx):
     """ARQ worker startup callback"""
@@ -8,6 +8,8 @@ import hashlib
 import json
 import logging
 import random
+import threading
+import time
 import uuid
 from collections import defaultdict
 from contextlib import contextmanager
@@ -2561,7 +2563,45 @@ def get_deduplication_rule_by_id(tenant_id, rule_id: str):
     return rules
 
 
+# custom deduplication rules are looked up once per ingested alert, so a burst
+# of alerts from the same provider would otherwise hit the rules table once per
+# alert - cache the lookups (including misses) for a short TTL and invalidate
+# on rule create/update/delete so changes apply immediately
+CUSTOM_DEDUPLICATION_RULE_CACHE_TTL = config(
+    "KEEP_CUSTOM_DEDUPLICATION_RULE_CACHE_TTL", cast=int, default=60
+)
+_CUSTOM_DEDUPLICATION_RULE_CACHE_MAXSIZE = 1024
+_custom_deduplication_rule_cache: dict = {}
+_custom_deduplication_rule_cache_lock = threading.Lock()
+
+
+def invalidate_custom_deduplication_rule_cache(tenant_id: str | None = None):
+    """Drop cached custom deduplication rule lookups.
+
+    Called on rule create/update/delete so ingestion picks up the change right
+    away instead of after the TTL. With no tenant_id, clears the whole cache
+    (tests use this between databases).
+    """
+    with _custom_deduplication_rule_cache_lock:
+        if tenant_id is None:
+            _custom_deduplication_rule_cache.clear()
+            return
+        for key in [
+            key for key in _custom_deduplication_rule_cache if key[0] == tenant_id
+        ]:
+            del _custom_deduplication_rule_cache[key]
+
+
 def get_custom_deduplication_rule(tenant_id, provider_id, provider_type):
+    cache_key = (tenant_id, provider_id, provider_type)
+    with _custom_deduplication_rule_cache_lock:
+        cached = _custom_deduplication_rule_cache.get(cache_key)
+        if (
+            cached
+            and time.monotonic() - cached[0] < CUSTOM_DEDUPLICATION_RULE_CACHE_TTL
+        ):
+            return cached[1]
+
     with Session(engine) as session:
         rule = session.exec(
             select(AlertDeduplicationRule)
@@ -2569,6 +2609,16 @@ def get_custom_deduplication_rule(tenant_id, provider_id, provider_type):
             .where(AlertDeduplicationRule.provider_id == provider_id)
             .where(AlertDeduplicationRule.provider_type == provider_type)
         ).first()
+
+    with _custom_deduplication_rule_cache_lock:
+        # key cardinality is tenants x providers, so the cache only ever fills
+        # up under pathological key churn - resetting it then is good enough
+        if (
+            len(_custom_deduplication_rule_cache)
+            >= _CUSTOM_DEDUPLICATION_RULE_CACHE_MAXSIZE
+        ):
+            _custom_deduplication_rule_cache.clear()
+        _custom_deduplication_rule_cache[cache_key] = (time.monotonic(), rule)
     return rule
 
 
@@ -2605,6 +2655,7 @@ def create_deduplication_rule(
         session.add(new_rule)
         session.commit()
         session.refresh(new_rule)
+    invalidate_custom_deduplication_rule_cache(tenant_id)
     return new_rule
 
 
@@ -2649,6 +2700,7 @@ def update_deduplication_rule(
         session.add(rule)
         session.commit()
         session.refresh(rule)
+    invalidate_custom_deduplication_rule_cache(tenant_id)
     return rule
 
 
@@ -2668,6 +2720,7 @@ def delete_deduplication_rule(rule_id: str, tenant_id: str) -> bool:
 
         session.delete(rule)
         session.commit()
+    invalidate_custom_deduplication_rule_cache(tenant_id)
     return True
 
 
@@ -4860,6 +4913,20 @@ def get_alerts_count(
         )
 
 
+def get_last_alerts_count(
+    tenant_id: str,
+) -> int:
+    # one row per fingerprint, i.e. the number of alerts GET /alerts returns
+    with Session(engine) as session:
+        return (
+            session.query(LastAlert)
+            .filter(
+                LastAlert.tenant_id == tenant_id,
+            )
+            .count()
+        )
+
+
 def get_first_alert_datetime(
     tenant_id: str,
 ) -> datetime | None:
@@ -173,7 +173,9 @@ class AlertDto(BaseModel):
             try:
                 dt = datetime.datetime.fromisoformat(date_string)
                 dt_utc = dt.astimezone(pytz.UTC)
-                return dt_utc.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+                return dt_utc.isoformat(timespec="milliseconds").replace(
+                    "+00:00", "Z"
+                )
             except ValueError:
                 return None
 
@@ -187,7 +189,7 @@ class AlertDto(BaseModel):
                 dt = datetime.datetime.fromtimestamp(
                     timestamp, tz=datetime.timezone.utc
                 )
-                return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+                return dt.isoformat(timespec="milliseconds").replace("+00:00", "Z")
             except (ValueError, TypeError):
                 return None
 
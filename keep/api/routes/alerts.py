@@ -42,6 +42,7 @@ from keep.api.core.db import get_error_alerts as get_error_alerts_db
 from keep.api.core.db import (
     get_last_alerts,
     get_last_alerts_by_fingerprints,
+    get_last_alerts_count,
     get_provider_by_name,
     get_session,
     is_all_alerts_resolved,
@@ -69,7 +70,7 @@ from keep.api.models.query import QueryDto
 from keep.api.models.search_alert import SearchAlertsRequest
 from keep.api.models.time_stamp import TimeStampFilter
 from keep.api.routes.preset import pull_data_from_providers
-from keep.api.tasks.process_event_task import process_event
+from keep.api.tasks.process_event_task import process_event, process_event_bulk
 from keep.api.utils.email_utils import EmailTemplates, send_email
 from keep.api.utils.enrichment_helpers import convert_db_alerts_to_dto_alerts
 from keep.api.utils.time_stamp_helpers import get_time_stamp_filter
@@ -279,6 +280,53 @@ def get_all_alerts(
     return enriched_alerts_dto
 
 
+@router.get(
+    "/wait",
+    description="Long-poll until the tenant has at least `count` alerts",
+)
+def wait_for_alerts(
+    count: int,
+    timeout: float = 10,
+    authenticated_entity: AuthenticatedEntity = Depends(
+        IdentityManagerFactory.get_auth_verifier(["read:alert"])
+    ),
+) -> list[AlertDto]:
+    """
+    Block until the tenant has at least `count` alerts or the timeout expires.
+
+    Ingestion happens in background workers, so callers (tests, automation)
+    would otherwise have to poll GET /alerts with client-side sleeps. This
+    endpoint moves the wait server-side: a single round-trip that returns the
+    alerts as soon as they are available.
+    """
+    tenant_id = authenticated_entity.tenant_id
+    logger.info(
+        "Waiting for alerts",
+        extra={
+            "tenant_id": tenant_id,
+            "count": count,
+            "timeout": timeout,
+        },
+    )
+    # exponential backoff - react quickly when ingestion is fast, back off to
+    # cheap infrequent checks when it isn't
+    deadline = time.time() + timeout
+    delay = 0.02
+    while get_last_alerts_count(tenant_id) < count and time.time() < deadline:
+        time.sleep(min(delay, max(deadline - time.time(), 0)))
+        delay = min(delay * 2, 0.5)
+    db_alerts = get_last_alerts(tenant_id=tenant_id)
+    enriched_alerts_dto = convert_db_alerts_to_dto_alerts(db_alerts)
+    logger.info(
+        "Done waiting for alerts",
+        extra={
+            "tenant_id": tenant_id,
+            "count": len(enriched_alerts_dto),
+        },
+    )
+    return enriched_alerts_dto
+
+
 @router.get("/{fingerprint}/history", description="Get alert history")
 def get_alert_history(
     fingerprint: str,
@@ -547,6 +595,7 @@ def create_process_event_task(
     trace_id: str,
     event: AlertDto | list[AlertDto] | dict,
     running_tasks: set,
+    bulk: bool = False,
 ) -> str:
     logger.info("Adding task", extra={"trace_id": trace_id})
     started_time = time.time()
@@ -555,7 +604,8 @@ def create_process_event_task(
         pid=os.getpid()
     ).inc()  # Increase process counter
     future = process_event_executor.submit(
-        process_event,
+        # bulk tasks process the whole batch sequentially in a single worker
+        process_event_bulk if bulk else process_event,
         {},  # ctx
         tenant_id,
         provider_type,
@@ -672,6 +722,7 @@ async def receive_event(
     provider_id: str | None = None,
     provider_name: str | None = None,
     fingerprint: str | None = None,
+    bulk: bool = False,
     event=Depends(extract_generic_body),
     authenticated_entity: AuthenticatedEntity = Depends(
         IdentityManagerFactory.get_auth_verifier(["write:alert"])
@@ -700,11 +751,20 @@ async def receive_event(
             status_code=400, detail=f"Provider {provider_type} not found"
         )
 
+    # bulk ingestion expects a JSON array of events
+    if bulk and not isinstance(event, list):
+        raise HTTPException(
+            status_code=400, detail="Bulk ingestion expects a list of events"
+        )
+
     # Parse the raw body
     t = time.time()
     logger.debug("Parsing event raw body")
     try:
-        event = provider_class.parse_event_raw_body(event)
+        if bulk:
+            event = [provider_class.parse_event_raw_body(e) for e in event]
+        else:
+            event = provider_class.parse_event_raw_body(event)
     except Exception:
         logger.exception(
             "Failed to parse event raw body",
@@ -727,7 +787,7 @@ async def receive_event(
     if REDIS:
         redis: ArqRedis = await get_pool()
         job = await redis.enqueue_job(
-            "process_event_in_worker",
+            "process_event_bulk_in_worker" if bulk else "process_event_in_worker",
             authenticated_entity.tenant_id,
             provider_type,
             provider_id,
@@ -756,6 +816,7 @@ async def receive_event(
             trace_id,
             event,
             running_tasks,
+            bulk=bulk,
         )
     return JSONResponse(content={"task_name": task_name}, status_code=202)
 
@@ -1,4 +1,5 @@
 import logging
+import time
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -32,6 +33,59 @@ def get_deduplications(
     return deduplications
 
 
+@router.get(
+    "/wait",
+    description="Long-poll until a deduplication rule matches the given stats",
+)
+def wait_for_deduplications(
+    dedup_ratio: float | None = None,
+    ingested: int | None = None,
+    timeout: float = 10,
+    authenticated_entity: AuthenticatedEntity = Depends(
+        IdentityManagerFactory.get_auth_verifier(["read:deduplications"])
+    ),
+):
+    """
+    Block until some deduplication rule reaches the given dedup_ratio and/or
+    ingested count, or until the timeout expires.
+
+    Deduplication stats are updated by background workers, so callers (tests,
+    automation) would otherwise have to poll GET /deduplications with
+    client-side sleeps. Returns the deduplication rules as soon as one of them
+    matches.
+    """
+    tenant_id = authenticated_entity.tenant_id
+    logger.info(
+        "Waiting for deduplications",
+        extra={
+            "tenant_id": tenant_id,
+            "dedup_ratio": dedup_ratio,
+            "ingested": ingested,
+            "timeout": timeout,
+        },
+    )
+    alert_deduplicator = AlertDeduplicator(tenant_id)
+    # exponential backoff with a deadline, like /alerts/wait - recomputing the
+    # dedup stats is not free, so back off once it's clear ingestion is slow
+    deadline = time.time() + timeout
+    delay = 0.02
+    while True:
+        deduplications = alert_deduplicator.get_deduplications()
+        if any(
+            (dedup_ratio is None or rule.dedup_ratio == dedup_ratio)
+            and (ingested is None or rule.ingested == ingested)
+            for rule in deduplications
+        ):
+            break
+        if time.time() >= deadline:
+            break
+        time.sleep(min(delay, max(deadline - time.time(), 0)))
+        delay = min(delay * 2, 0.5)
+
+    logger.info("Done waiting for deduplications")
+    return deduplications
+
+
 @router.get(
     "/fields",
     description="Get Optional Fields For Deduplications",
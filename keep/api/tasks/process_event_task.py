@@ -821,6 +821,45 @@ def process_event(
         session.close()
 
 
+def process_event_bulk(
+    ctx: dict,  # arq context
+    tenant_id: str,
+    provider_type: str | None,
+    provider_id: str | None,
+    fingerprint: str | None,
+    api_key_name: str | None,
+    trace_id: str | None,
+    events: list,  # a batch of raw events, each one in the provider's format
+    notify_client: bool = True,
+    timestamp_forced: datetime.datetime | None = None,
+) -> list[Alert]:
+    """
+    Process a batch of events through the single-event path, one by one.
+
+    This keeps the exact same semantics as N separate calls to process_event -
+    each event sees the alerts that were ingested before it, so deduplication
+    works within the batch - while amortizing the per-event HTTP and auth
+    overhead into a single request.
+    """
+    processed_events = []
+    for event in events:
+        result = process_event(
+            ctx,
+            tenant_id,
+            provider_type,
+            provider_id,
+            fingerprint,
+            api_key_name,
+            trace_id,
+            event,
+            notify_client,
+            timestamp_forced,
+        )
+        if result:
+            processed_events.extend(result)
+    return processed_events
+
+
 def __save_error_alerts(
     tenant_id,
     provider_type,
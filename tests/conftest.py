@@ -215,6 +215,10 @@ def db_session(request, monkeypatch, tmp_path):
         db_connection_string = request.getfixturevalue(f"{db_type}_container")
         monkeypatch.setenv("DATABASE_CONNECTION_STRING", db_connection_string)
         mock_engine = create_engine(db_connection_string)
+
+        # the container database persists across tests, so let create_all
+        # check which tables already exist
+        SQLModel.metadata.create_all(mock_engine)
     # sqlite
     else:
         db_connection_string = "sqlite:///:memory:"
@@ -240,7 +244,9 @@ def db_session(request, monkeypatch, tmp_path):
             except Exception:
                 pass
 
-    SQLModel.metadata.create_all(mock_engine)
+        # the in-memory database is always fresh, so skip the per-table
+        # existence checks create_all would otherwise issue
+        SQLModel.metadata.create_all(mock_engine, checkfirst=False)
 
     # Mock the environment variables so db.py will use it
     os.environ["DATABASE_CONNECTION_STRING"] = db_connection_string
@@ -315,10 +321,15 @@ actions:
 
     import logging
 
+    from keep.api.core.db import invalidate_custom_deduplication_rule_cache
+
     logger = logging.getLogger(__name__)
     logger.info("Dropping all tables")
     # delete the database
     SQLModel.metadata.drop_all(mock_engine)
+    # the rule cache is process-wide and would leak into the next test's
+    # fresh database
+    invalidate_custom_deduplication_rule_cache()
     # Clean up after the test
     session.close()
 
@@ -1,62 +1,201 @@
+import copy
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import random
-import time
 import uuid
 from datetime import datetime, timedelta
 
 import pytest
 import pytz
-from sqlalchemy import text
+from sqlalchemy import delete, insert, select
 
-from keep.api.core.db import get_last_alerts
 from keep.api.core.dependencies import SINGLE_TENANT_UUID
 from keep.api.models.alert import DeduplicationRuleDto, AlertStatus
-from keep.api.models.db.alert import AlertDeduplicationRule, AlertDeduplicationEvent, Alert
-from keep.api.utils.enrichment_helpers import convert_db_alerts_to_dto_alerts
+from keep.api.models.db.alert import (
+    Alert,
+    AlertDeduplicationEvent,
+    AlertDeduplicationRule,
+    AlertEnrichment,
+    LastAlert,
+)
+from keep.providers.datadog_provider.alerts_mock import ALERTS as DATADOG_ALERTS_MOCK
 from keep.providers.providers_factory import ProvidersFactory
-from tests.fixtures.client import client, setup_api_key, test_app  # noqa
+from tests.fixtures.client import (  # noqa
+    client,
+    post_json,
+    setup_api_key,
+    test_app,
+    wait_for_alerts,
+    wait_for_dedup_rules,
+)
 
 # Set the log level to DEBUG
 logging.basicConfig(level=logging.DEBUG)
 
+# keep these I/O-bound tests on a single pytest-xdist worker (they reload the
+# app modules and share the process-wide event worker pool), running in
+# parallel with the rest of the suite under `pytest -n auto --dist loadgroup`
+pytestmark = pytest.mark.xdist_group(name="deduplication")
 
-def wait_for_alerts(client, num_alerts):
-    alerts = client.get("/alerts", headers={"x-api-key": "some-api-key"}).json()
-    print(f"------------- Total alerts: {len(alerts)}")
-    while len(alerts) != num_alerts:
-        time.sleep(1)
-        alerts = client.get("/alerts", headers={"x-api-key": "some-api-key"}).json()
-        print(f"------------- Total alerts: {len(alerts)}")
+# the test_app parametrizations this module keeps repeating - note that some
+# tests don't use the test_app fixture at all, so a module-level pytestmark
+# would not work here
+noauth_test_app = pytest.mark.parametrize(
+    "test_app",
+    [
+        {
+            "AUTH_TYPE": "NOAUTH",
+        },
+    ],
+    indirect=True,
+)
 
+# every authenticated call in this module uses the same api key - build the
+# headers dict once instead of allocating it at each call site (a true
+# session-scoped client is off the table: test_app is parametrized over env
+# vars and the database is per-test, so the app must be rebuilt every test)
+HEADERS = {"x-api-key": "some-api-key"}
 
-@pytest.mark.parametrize(
+noauth_datadog_test_app = pytest.mark.parametrize(
     "test_app",
     [
         {
             "AUTH_TYPE": "NOAUTH",
+            "KEEP_PROVIDERS": '{"keepDatadog":{"type":"datadog","authentication":{"api_key":"1234","app_key": "1234"}}}',
         },
     ],
     indirect=True,
 )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_provider_class(provider_type):
+    # ProvidersFactory.get_provider_class re-resolves the provider module on
+    # every call - cache it at module scope since almost every test needs it
+    return ProvidersFactory.get_provider_class(provider_type)
+
+
+def _last_received_values(db_session):
+    # column-only query - the test only asserts on lastReceived, so there is
+    # no need to hydrate full Alert ORM objects and convert them to DTOs.
+    # lastReceived of a deduplicated alert lives in the enrichments, so merge
+    # them over the event like convert_db_alerts_to_dto_alerts does.
+    rows = db_session.execute(
+        select(Alert.event, AlertEnrichment.enrichments)
+        .select_from(LastAlert)
+        .join(Alert, LastAlert.alert_id == Alert.id)
+        .outerjoin(
+            AlertEnrichment,
+            (AlertEnrichment.tenant_id == Alert.tenant_id)
+            & (AlertEnrichment.alert_fingerprint == Alert.fingerprint),
+        )
+        .where(LastAlert.tenant_id == SINGLE_TENANT_UUID)
+    ).all()
+    return [
+        {**event, **(enrichments or {})}.get("lastReceived")
+        for event, enrichments in rows
+    ]
+
+
+def simulate_alert_minimal():
+    """
+    Deterministic stand-in for DatadogProvider.simulate_alert().
+
+    Applies the same parameter/render substitutions as simulate_alert but
+    always takes the first choice, so tests that don't care about payload
+    variability get a stable alert without any random calls.
+    """
+    alert_data = DATADOG_ALERTS_MOCK["high_cpu_usage"]
+    simulated_alert = alert_data["payload"].copy()
+
+    for param, choices in alert_data.get("parameters", {}).items():
+        param_parts = param.split(".")
+        target = simulated_alert
+        for part in param_parts[:-1]:
+            target = target.setdefault(part, {})
+        target[param_parts[-1]] = choices[0]
+
+    for param, choices in alert_data.get("renders", {}).items():
+        param_to_replace = "{{" + param + "}}"
+        for key, val in simulated_alert.items():
+            simulated_alert[key] = val.replace(param_to_replace, choices[0])
+        simulated_alert[param] = choices[0]
+
+    simulated_alert["last_updated"] = 1704067200000
+    simulated_alert["alert_transition"] = "Triggered"
+    simulated_alert["id"] = "minimal-simulated-alert"
+    return simulated_alert
+
+
+# the invariant parts of a prometheus alert payload - tests build concrete
+# alerts with {**_PROMETHEUS_ALERT_TEMPLATE, "labels": ..., ...} so the two
+# payloads of a dedup pair only differ where the test intends them to
+_PROMETHEUS_ALERT_TEMPLATE = {
+    "summary": "Test summary",
+    "annotations": {
+        "runbook": "http://example.com",
+        "description": "Test description",
+    },
+    "generatorURL": "http://prometheus:9090/graph",
+    "endsAt": "0001-01-01T00:00:00Z",
+    "status": "firing",
+}
+
+
+def _custom_rule_payload(**overrides):
+    # the request payload shared by the "custom rule" tests - the rule row
+    # itself cannot be shared because every test runs on a fresh database
+    payload = {
+        "name": "Custom Rule",
+        "description": "Custom Rule Description",
+        "provider_type": "datadog",
+        "fingerprint_fields": ["title", "message"],
+        "full_deduplication": False,
+        "ignore_fields": None,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _bulk_post_events(client, provider_type, alerts):
+    # post all the alerts in a single request - the worker processes them
+    # one by one so deduplication semantics are the same as N separate posts
+    response = post_json(
+        client,
+        f"/alerts/event/{provider_type}?bulk=true",
+        alerts,
+        headers=HEADERS,
+    )
+    assert response.status_code == 202
+    return response
+
+
+@noauth_test_app
 def test_default_deduplication_rule(db_session, client, test_app):
     # insert an alert with some provider_id and make sure that the default deduplication rule is working
     provider_classes = {
-        provider: ProvidersFactory.get_provider_class(provider)
+        provider: _get_provider_class(provider)
         for provider in ["datadog", "prometheus"]
     }
-    for provider_type, provider in provider_classes.items():
-        alert = provider.simulate_alert()
-        client.post(
-            f"/alerts/event/{provider_type}?",
-            json=alert,
-            headers={"x-api-key": "some-api-key"},
-        )
-        time.sleep(0.1)
+    # the two posts are independent (different providers), fan them out
+    with ThreadPoolExecutor(max_workers=len(provider_classes)) as executor:
+        futures = [
+            executor.submit(
+                client.post,
+                f"/alerts/event/{provider_type}",
+                json=provider.simulate_alert(),
+                headers=HEADERS,
+            )
+            for provider_type, provider in provider_classes.items()
+        ]
+        for future in futures:
+            assert future.result().status_code == 202
 
     wait_for_alerts(client, 2)
 
     deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
+        "/deduplications", headers=HEADERS
     ).json()
     assert len(deduplication_rules) == 3  # default + datadog + prometheus
 
@@ -78,38 +217,16 @@ def test_default_deduplication_rule(db_session, client, test_app):
 
 
 @pytest.mark.timeout(15)
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_deduplication_sanity(db_session, client, test_app):
     # insert the same alert twice and make sure that the default deduplication rule is working
     # insert an alert with some provider_id and make sure that the default deduplication rule is working
-    provider = ProvidersFactory.get_provider_class("datadog")
-    alert = provider.simulate_alert()
-    for i in range(2):
-        client.post(
-            "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
-        )
-        time.sleep(0.1)
-
-    wait_for_alerts(client, 1)
+    alert = simulate_alert_minimal()
+    _bulk_post_events(client, "datadog", [alert, alert])
 
-    deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
-    ).json()
-    while not any(
-        [rule for rule in deduplication_rules if rule.get("dedup_ratio") == 50.0]
-    ):
-        time.sleep(0.1)
-        deduplication_rules = client.get(
-            "/deduplications", headers={"x-api-key": "some-api-key"}
-        ).json()
+    # a 50% dedup ratio implies both events were ingested, so one wait on the
+    # dedup stats covers the alert ingestion as well
+    deduplication_rules = wait_for_dedup_rules(client, dedup_ratio=50.0)
 
     assert len(deduplication_rules) == 2  # default + datadog
 
@@ -127,46 +244,17 @@ def test_deduplication_sanity(db_session, client, test_app):
 
 
 @pytest.mark.timeout(10)
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_deduplication_sanity_2(db_session, client, test_app):
     # insert two different alerts, twice each, and make sure that the default deduplication rule is working
-    provider = ProvidersFactory.get_provider_class("datadog")
-    alert1 = provider.simulate_alert()
-    alert2 = alert1
-    # datadog deduplicated by monitor_id
-    while alert2.get("monitor_id") == alert1.get("monitor_id"):
-        alert2 = provider.simulate_alert()
-
-    for alert in [alert1, alert2]:
-        for _ in range(2):
-            client.post(
-                "/alerts/event/datadog",
-                json=alert,
-                headers={"x-api-key": "some-api-key"},
-            )
-            time.sleep(0.1)
-
-    wait_for_alerts(client, 2)
+    alert1 = simulate_alert_minimal()
+    # datadog deduplicates by monitor_id, so just give the second alert a
+    # different one instead of re-simulating until the random ids differ
+    alert2 = {**alert1, "monitor_id": str(int(alert1["monitor_id"]) + 1)}
 
-    deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
-    ).json()
+    _bulk_post_events(client, "datadog", [alert1, alert1, alert2, alert2])
 
-    while not any(
-        [rule for rule in deduplication_rules if rule.get("dedup_ratio") == 50.0]
-    ):
-        time.sleep(0.1)
-        deduplication_rules = client.get(
-            "/deduplications", headers={"x-api-key": "some-api-key"}
-        ).json()
+    deduplication_rules = wait_for_dedup_rules(client, dedup_ratio=50.0)
 
     assert len(deduplication_rules) == 2  # default + datadog
 
@@ -178,19 +266,13 @@ def test_deduplication_sanity_2(db_session, client, test_app):
 
 
 @pytest.mark.timeout(20)
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_deduplication_sanity_3(db_session, client, test_app):
     # insert many alerts and make sure that the default deduplication rule is working
-    provider = ProvidersFactory.get_provider_class("datadog")
-    alerts = [provider.simulate_alert() for _ in range(10)]
+    # build once and shallow-copy - the alerts only need to differ by
+    # monitor_id, so there is no point rolling a fresh random payload 10 times
+    base_alert = simulate_alert_minimal()
+    alerts = [copy.copy(base_alert) for _ in range(10)]
 
     monitor_ids = set()
     for alert in alerts:
@@ -198,16 +280,10 @@ def test_deduplication_sanity_3(db_session, client, test_app):
         while alert["monitor_id"] in monitor_ids:
             alert["monitor_id"] = random.randint(0, 10**10)
         monitor_ids.add(alert["monitor_id"])
-        client.post(
-            "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
-        )
-        time.sleep(0.1)
 
-    wait_for_alerts(client, 10)
+    _bulk_post_events(client, "datadog", alerts)
 
-    deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
-    ).json()
+    deduplication_rules = wait_for_dedup_rules(client, ingested=10)
 
     assert len(deduplication_rules) == 2  # default + datadog
 
@@ -218,61 +294,31 @@ def test_deduplication_sanity_3(db_session, client, test_app):
             assert dedup_rule.get("default")
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_custom_deduplication_rule(db_session, client, test_app):
-    provider = ProvidersFactory.get_provider_class("datadog")
+    provider = _get_provider_class("datadog")
     alert1 = provider.simulate_alert()
     client.post(
-        "/alerts/event/datadog", json=alert1, headers={"x-api-key": "some-api-key"}
+        "/alerts/event/datadog", json=alert1, headers=HEADERS
     )
 
     # wait for the background tasks to finish
     wait_for_alerts(client, 1)
 
     # create a custom deduplication rule and insert alerts that should be deduplicated by this
-    custom_rule = {
-        "name": "Custom Rule",
-        "description": "Custom Rule Description",
-        "provider_type": "datadog",
-        "fingerprint_fields": ["title", "message"],
-        "full_deduplication": False,
-        "ignore_fields": None,
-    }
+    custom_rule = _custom_rule_payload()
 
     resp = client.post(
-        "/deduplications", json=custom_rule, headers={"x-api-key": "some-api-key"}
+        "/deduplications", json=custom_rule, headers=HEADERS
     )
     assert resp.status_code == 200
 
-    provider = ProvidersFactory.get_provider_class("datadog")
     alert = provider.simulate_alert()
 
-    for _ in range(2):
-        # shoot two alerts with the same title and message, dedup should be 50%
-        client.post(
-            "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
-        )
-        time.sleep(0.3)
-
-    deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
-    ).json()
+    # shoot two alerts with the same title and message, dedup should be 50%
+    _bulk_post_events(client, "datadog", [alert, alert])
 
-    while not any(
-        [rule for rule in deduplication_rules if rule.get("dedup_ratio") == 50.0]
-    ):
-        time.sleep(0.1)
-        deduplication_rules = client.get(
-            "/deduplications", headers={"x-api-key": "some-api-key"}
-        ).json()
+    deduplication_rules = wait_for_dedup_rules(client, dedup_ratio=50.0)
 
     custom_rule_found = False
     for dedup_rule in deduplication_rules:
@@ -285,63 +331,36 @@ def test_custom_deduplication_rule(db_session, client, test_app):
     assert custom_rule_found
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_custom_deduplication_rule_behaviour(db_session, client, test_app):
     # create a custom deduplication rule and insert alerts that should be deduplicated by this
-    provider = ProvidersFactory.get_provider_class("datadog")
+    provider = _get_provider_class("datadog")
     alert1 = provider.simulate_alert()
     client.post(
-        "/alerts/event/datadog", json=alert1, headers={"x-api-key": "some-api-key"}
+        "/alerts/event/datadog", json=alert1, headers=HEADERS
     )
 
     # wait for the background tasks to finish
     wait_for_alerts(client, 1)
 
-    custom_rule = {
-        "name": "Custom Rule",
-        "description": "Custom Rule Description",
-        "provider_type": "datadog",
-        "fingerprint_fields": ["title", "message"],
-        "full_deduplication": False,
-        "ignore_fields": None,
-    }
+    custom_rule = _custom_rule_payload()
 
     resp = client.post(
-        "/deduplications", json=custom_rule, headers={"x-api-key": "some-api-key"}
+        "/deduplications", json=custom_rule, headers=HEADERS
     )
     assert resp.status_code == 200
 
-    provider = ProvidersFactory.get_provider_class("datadog")
     alert = provider.simulate_alert()
 
-    for _ in range(2):
-        # the default rule should deduplicate the alert by monitor_id so let's randomize it -
-        # if the custom rule is working, the alert should be deduplicated by title and message
-        alert["monitor_id"] = random.randint(0, 10**10)
-        client.post(
-            "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
-        )
-        time.sleep(0.3)
-
-    deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
-    ).json()
+    # the default rule should deduplicate the alert by monitor_id so let's randomize it -
+    # if the custom rule is working, the alert should be deduplicated by title and message
+    _bulk_post_events(
+        client,
+        "datadog",
+        [{**alert, "monitor_id": random.randint(0, 10**10)} for _ in range(2)],
+    )
 
-    while not any(
-        [rule for rule in deduplication_rules if rule.get("dedup_ratio") == 50.0]
-    ):
-        time.sleep(1)
-        deduplication_rules = client.get(
-            "/deduplications", headers={"x-api-key": "some-api-key"}
-        ).json()
+    deduplication_rules = wait_for_dedup_rules(client, dedup_ratio=50.0)
 
     custom_rule_found = False
     for dedup_rule in deduplication_rules:
@@ -354,66 +373,48 @@ def test_custom_deduplication_rule_behaviour(db_session, client, test_app):
     assert custom_rule_found
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-            "KEEP_PROVIDERS": '{"keepDatadog":{"type":"datadog","authentication":{"api_key":"1234","app_key": "1234"}}}',
-        },
-    ],
-    indirect=True,
-)
+@noauth_datadog_test_app
 def test_custom_deduplication_rule_2(db_session, client, test_app):
     # create a custom full deduplication rule and insert alerts that should not be deduplicated by this
-    providers = client.get("/providers", headers={"x-api-key": "some-api-key"}).json()
+    providers = client.get("/providers", headers=HEADERS).json()
     datadog_provider_id = next(
         provider["id"]
         for provider in providers.get("installed_providers")
         if provider["type"] == "datadog"
     )
 
-    custom_rule = {
-        "name": "Custom Rule",
-        "description": "Custom Rule Description",
-        "provider_type": "datadog",
-        "provider_id": datadog_provider_id,
-        "fingerprint_fields": [
-            "name",
-            "message",
-        ],  # title in datadog mapped to name in keep
-        "full_deduplication": False,
-        "ignore_fields": ["field_that_never_exists"],
-    }
+    custom_rule = _custom_rule_payload(
+        provider_id=datadog_provider_id,
+        # title in datadog mapped to name in keep
+        fingerprint_fields=["name", "message"],
+        ignore_fields=["field_that_never_exists"],
+    )
 
     response = client.post(
-        "/deduplications", json=custom_rule, headers={"x-api-key": "some-api-key"}
+        "/deduplications", json=custom_rule, headers=HEADERS
     )
     assert response.status_code == 200
 
-    provider = ProvidersFactory.get_provider_class("datadog")
+    provider = _get_provider_class("datadog")
     alert1 = provider.simulate_alert()
 
     client.post(
         f"/alerts/event/datadog?provider_id={datadog_provider_id}",
         json=alert1,
-        headers={"x-api-key": "some-api-key"},
+        headers=HEADERS,
     )
     alert1["title"] = "Different title"
     client.post(
         f"/alerts/event/datadog?provider_id={datadog_provider_id}",
         json=alert1,
-        headers={"x-api-key": "some-api-key"},
+        headers=HEADERS,
     )
 
     # wait for the background tasks to finish
-    alerts = client.get("/alerts", headers={"x-api-key": "some-api-key"}).json()
-    while len(alerts) < 2:
-        time.sleep(1)
-        alerts = client.get("/alerts", headers={"x-api-key": "some-api-key"}).json()
+    wait_for_alerts(client, 2)
 
     deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
+        "/deduplications", headers=HEADERS
     ).json()
 
     custom_rule_found = False
@@ -427,19 +428,10 @@ def test_custom_deduplication_rule_2(db_session, client, test_app):
     assert custom_rule_found
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-            "KEEP_PROVIDERS": '{"keepDatadog":{"type":"datadog","authentication":{"api_key":"1234","app_key": "1234"}}}',
-        },
-    ],
-    indirect=True,
-)
+@noauth_datadog_test_app
 def test_update_deduplication_rule(db_session, client, test_app):
     # create a custom deduplication rule and update it
-    response = client.get("/providers", headers={"x-api-key": "some-api-key"})
+    response = client.get("/providers", headers=HEADERS)
     assert response.status_code == 200
     datadog_provider_id = next(
         provider["id"]
@@ -447,41 +439,30 @@ def test_update_deduplication_rule(db_session, client, test_app):
         if provider["type"] == "datadog"
     )
 
-    custom_rule = {
-        "name": "Custom Rule",
-        "description": "Custom Rule Description",
-        "provider_type": "datadog",
-        "provider_id": datadog_provider_id,
-        "fingerprint_fields": ["title", "message"],
-        "full_deduplication": False,
-        "ignore_fields": None,
-    }
+    custom_rule = _custom_rule_payload(provider_id=datadog_provider_id)
 
     response = client.post(
-        "/deduplications", json=custom_rule, headers={"x-api-key": "some-api-key"}
+        "/deduplications", json=custom_rule, headers=HEADERS
     )
     assert response.status_code == 200
 
     rule_id = response.json().get("id")
-    updated_rule = {
-        "name": "Updated Custom Rule",
-        "description": "Updated Custom Rule",
-        "provider_type": "datadog",
-        "provider_id": datadog_provider_id,
-        "fingerprint_fields": ["title"],
-        "full_deduplication": False,
-        "ignore_fields": None,
-    }
+    updated_rule = _custom_rule_payload(
+        name="Updated Custom Rule",
+        description="Updated Custom Rule",
+        provider_id=datadog_provider_id,
+        fingerprint_fields=["title"],
+    )
 
     response = client.put(
         f"/deduplications/{rule_id}",
         json=updated_rule,
-        headers={"x-api-key": "some-api-key"},
+        headers=HEADERS,
     )
     assert response.status_code == 200
 
     deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
+        "/deduplications", headers=HEADERS
     ).json()
 
     updated_rule_found = False
@@ -494,76 +475,39 @@ def test_update_deduplication_rule(db_session, client, test_app):
     assert updated_rule_found
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_update_deduplication_rule_non_exist_provider(db_session, client, test_app):
     # create a custom deduplication rule and update it
-    custom_rule = {
-        "name": "Custom Rule",
-        "description": "Custom Rule Description",
-        "provider_type": "datadog",
-        "fingerprint_fields": ["title", "message"],
-        "full_deduplication": False,
-        "ignore_fields": None,
-    }
+    custom_rule = _custom_rule_payload()
     response = client.post(
-        "/deduplications", json=custom_rule, headers={"x-api-key": "some-api-key"}
+        "/deduplications", json=custom_rule, headers=HEADERS
     )
     assert response.status_code == 404
     assert response.json() == {"detail": "Provider datadog not found"}
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_update_deduplication_rule_linked_provider(db_session, client, test_app):
-    provider = ProvidersFactory.get_provider_class("datadog")
+    provider = _get_provider_class("datadog")
     alert1 = provider.simulate_alert()
     response = client.post(
-        "/alerts/event/datadog", json=alert1, headers={"x-api-key": "some-api-key"}
+        "/alerts/event/datadog", json=alert1, headers=HEADERS
     )
 
-    time.sleep(2)
-    custom_rule = {
-        "name": "Custom Rule",
-        "description": "Custom Rule Description",
-        "provider_type": "datadog",
-        "fingerprint_fields": ["title", "message"],
-        "full_deduplication": False,
-        "ignore_fields": None,
-    }
+    # wait for the alert to be ingested so the linked provider exists
+    wait_for_alerts(client, 1)
+
+    custom_rule = _custom_rule_payload()
     response = client.post(
-        "/deduplications", json=custom_rule, headers={"x-api-key": "some-api-key"}
+        "/deduplications", json=custom_rule, headers=HEADERS
     )
     # once a linked provider is created, a customization should be allowed
     assert response.status_code == 200
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-            "KEEP_PROVIDERS": '{"keepDatadog":{"type":"datadog","authentication":{"api_key":"1234","app_key": "1234"}}}',
-        },
-    ],
-    indirect=True,
-)
+@noauth_datadog_test_app
 def test_delete_deduplication_rule_sanity(db_session, client, test_app):
-    response = client.get("/providers", headers={"x-api-key": "some-api-key"})
+    response = client.get("/providers", headers=HEADERS)
     assert response.status_code == 200
     datadog_provider_id = next(
         provider["id"]
@@ -571,44 +515,28 @@ def test_delete_deduplication_rule_sanity(db_session, client, test_app):
         if provider["type"] == "datadog"
     )
     # create a custom deduplication rule and delete it
-    custom_rule = {
-        "name": "Custom Rule",
-        "description": "Custom Rule Description",
-        "provider_type": "datadog",
-        "provider_id": datadog_provider_id,
-        "fingerprint_fields": ["title", "message"],
-        "full_deduplication": False,
-        "ignore_fields": None,
-    }
+    custom_rule = _custom_rule_payload(provider_id=datadog_provider_id)
 
     response = client.post(
-        "/deduplications", json=custom_rule, headers={"x-api-key": "some-api-key"}
+        "/deduplications", json=custom_rule, headers=HEADERS
     )
     assert response.status_code == 200
 
     rule_id = response.json().get("id")
-    client.delete(f"/deduplications/{rule_id}", headers={"x-api-key": "some-api-key"})
+    client.delete(f"/deduplications/{rule_id}", headers=HEADERS)
 
     deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
+        "/deduplications", headers=HEADERS
     ).json()
 
     assert all(rule.get("id") != rule_id for rule in deduplication_rules)
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_delete_deduplication_rule_invalid(db_session, client, test_app):
     # try to delete a deduplication rule that does not exist
     response = client.delete(
-        "/deduplications/non-existent-id", headers={"x-api-key": "some-api-key"}
+        "/deduplications/non-existent-id", headers=HEADERS
     )
 
     assert response.status_code == 400
@@ -617,36 +545,25 @@ def test_delete_deduplication_rule_invalid(db_session, client, test_app):
     # now use UUID
     some_uuid = str(uuid.uuid4())
     response = client.delete(
-        f"/deduplications/{some_uuid}", headers={"x-api-key": "some-api-key"}
+        f"/deduplications/{some_uuid}", headers=HEADERS
     )
     assert response.status_code == 404
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_delete_deduplication_rule_default(db_session, client, test_app):
     # shoot an alert to create a default deduplication rule
-    provider = ProvidersFactory.get_provider_class("datadog")
+    provider = _get_provider_class("datadog")
     alert = provider.simulate_alert()
     client.post(
-        "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
+        "/alerts/event/datadog", json=alert, headers=HEADERS
     )
 
-    alerts = client.get("/alerts", headers={"x-api-key": "some-api-key"}).json()
-    while len(alerts) != 1:
-        time.sleep(1)
-        alerts = client.get("/alerts", headers={"x-api-key": "some-api-key"}).json()
+    wait_for_alerts(client, 1)
 
     # try to delete a default deduplication rule
     deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
+        "/deduplications", headers=HEADERS
     ).json()
 
     default_rule_id = next(
@@ -654,7 +571,7 @@ def test_delete_deduplication_rule_default(db_session, client, test_app):
     )
 
     response = client.delete(
-        f"/deduplications/{default_rule_id}", headers={"x-api-key": "some-api-key"}
+        f"/deduplications/{default_rule_id}", headers=HEADERS
     )
 
     assert response.status_code == 404
@@ -663,22 +580,14 @@ def test_delete_deduplication_rule_default(db_session, client, test_app):
 """
 SHAHAR: should be resolved
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_full_deduplication(db_session, client, test_app):
     # create a custom deduplication rule with full deduplication and insert alerts that should be deduplicated by this
-    provider = ProvidersFactory.get_provider_class("datadog")
+    provider = _get_provider_class("datadog")
     alert = provider.simulate_alert()
     # send the alert so a linked provider is created
     response = client.post(
-        "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
+        "/alerts/event/datadog", json=alert, headers=HEADERS
     )
     custom_rule = {
         "name": "Full Deduplication Rule",
@@ -690,17 +599,17 @@ def test_full_deduplication(db_session, client, test_app):
     }
 
     response = client.post(
-        "/deduplications", json=custom_rule, headers={"x-api-key": "some-api-key"}
+        "/deduplications", json=custom_rule, headers=HEADERS
     )
     assert response.status_code == 200
 
     for _ in range(3):
         client.post(
-            "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
+            "/alerts/event/datadog", json=alert, headers=HEADERS
         )
 
     deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
+        "/deduplications", headers=HEADERS
     ).json()
 
     full_dedup_rule_found = False
@@ -714,19 +623,10 @@ def test_full_deduplication(db_session, client, test_app):
 """
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_partial_deduplication(db_session, client, test_app):
     # insert a datadog alert with the same incident_id, group and title and make sure that the datadog default deduplication rule is working
-    provider = ProvidersFactory.get_provider_class("datadog")
-    base_alert = provider.simulate_alert()
+    base_alert = simulate_alert_minimal()
 
     alerts = [
         base_alert,
@@ -734,23 +634,9 @@ def test_partial_deduplication(db_session, client, test_app):
         {**base_alert, "source": "Different source"},
     ]
 
-    for alert in alerts:
-        client.post(
-            "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
-        )
-        time.sleep(0.2)
-
-    wait_for_alerts(client, 1)
-
-    deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
-    ).json()
+    _bulk_post_events(client, "datadog", alerts)
 
-    while not any([rule for rule in deduplication_rules if rule.get("ingested") == 3]):
-        time.sleep(1)
-        deduplication_rules = client.get(
-            "/deduplications", headers={"x-api-key": "some-api-key"}
-        ).json()
+    deduplication_rules = wait_for_dedup_rules(client, ingested=3)
 
     datadog_rule_found = False
     for dedup_rule in deduplication_rules:
@@ -765,31 +651,22 @@ def test_partial_deduplication(db_session, client, test_app):
     assert datadog_rule_found
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_ingesting_alert_without_fingerprint_fields(db_session, client, test_app):
     # insert a datadog alert without the required fingerprint fields and make sure that it is not deduplicated
-    provider = ProvidersFactory.get_provider_class("datadog")
-    alert = provider.simulate_alert()
+    alert = simulate_alert_minimal()
     alert.pop("incident_id", None)
     alert.pop("group", None)
     alert["title"] = str(random.randint(0, 10**10))
 
     client.post(
-        "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
+        "/alerts/event/datadog", json=alert, headers=HEADERS
     )
 
     wait_for_alerts(client, 1)
 
     deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
+        "/deduplications", headers=HEADERS
     ).json()
 
     datadog_rule_found = False
@@ -803,19 +680,10 @@ def test_ingesting_alert_without_fingerprint_fields(db_session, client, test_app
 
 
 @pytest.mark.timeout(15)
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_deduplication_fields(db_session, client, test_app):
     # insert a datadog alert with the same incident_id and make sure that the datadog default deduplication rule is working
-    provider = ProvidersFactory.get_provider_class("datadog")
-    base_alert = provider.simulate_alert()
+    base_alert = simulate_alert_minimal()
 
     alerts = [
         base_alert,
@@ -823,23 +691,9 @@ def test_deduplication_fields(db_session, client, test_app):
         {**base_alert, "title": "Different title"},
     ]
 
-    for alert in alerts:
-        client.post(
-            "/alerts/event/datadog", json=alert, headers={"x-api-key": "some-api-key"}
-        )
-
-    wait_for_alerts(client, 1)
-
-    deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
-    ).json()
+    _bulk_post_events(client, "datadog", alerts)
 
-    while not any([rule for rule in deduplication_rules if rule.get("ingested") == 3]):
-        print("Waiting for deduplication rules to be ingested")
-        time.sleep(1)
-        deduplication_rules = client.get(
-            "/deduplications", headers={"x-api-key": "some-api-key"}
-        ).json()
+    deduplication_rules = wait_for_dedup_rules(client, ingested=3)
 
     datadog_rule_found = False
     for dedup_rule in deduplication_rules:
@@ -854,27 +708,37 @@ def test_deduplication_fields(db_session, client, test_app):
 # @pytest.mark.parametrize("test_app", [{"AUTH_TYPE": "NOAUTH"}])
 def test_full_deduplication_last_received(db_session, create_alert):
 
-    db_session.exec(text("DELETE FROM alertdeduplicationrule"))
-    dedup = AlertDeduplicationRule(
-        name="Test Rule",
-        fingerprint_fields=["service",],
-        full_deduplication=True,
-        ignore_fields=["fingerprint", "lastReceived", "id"],
-        is_provisioned=True,
-        tenant_id=SINGLE_TENANT_UUID,
-        description="test",
-        provider_id="test",
-        provider_type="keep",
-        last_updated_by="test",
-        created_by="test",
-    )
-    db_session.add(dedup)
+    # Core bulk delete - no raw SQL and no ORM unit-of-work involved
+    db_session.execute(delete(AlertDeduplicationRule))
+    # Core insert - no ORM instance / identity-map bookkeeping needed here,
+    # the rule is only read back by the deduplicator
+    db_session.execute(
+        insert(AlertDeduplicationRule).values(
+            name="Test Rule",
+            fingerprint_fields=["service"],
+            full_deduplication=True,
+            ignore_fields=["fingerprint", "lastReceived", "id"],
+            is_provisioned=True,
+            tenant_id=SINGLE_TENANT_UUID,
+            description="test",
+            provider_id="test",
+            provider_type="keep",
+            last_updated_by="test",
+            created_by="test",
+        )
+    )
     db_session.commit()
-    db_session.refresh(dedup)
 
     dt1 = datetime.utcnow()
     dt2 = dt1 + timedelta(hours=1)
 
+    # precompute the expected lastReceived strings the way AlertDto formats
+    # them (millisecond-precision UTC ISO with a Z suffix)
+    expected1, expected2 = (
+        dt.astimezone(pytz.UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        for dt in (dt1, dt2)
+    )
+
     create_alert(
         None,
         AlertStatus.FIRING,
@@ -886,10 +750,9 @@ def test_full_deduplication_last_received(db_session, create_alert):
     )
 
     assert db_session.query(Alert).count() == 1
-    alerts = get_last_alerts(SINGLE_TENANT_UUID)
-    alerts_dto = convert_db_alerts_to_dto_alerts(alerts)
+    last_received_values = _last_received_values(db_session)
 
-    assert alerts_dto[0].lastReceived == dt1.astimezone(pytz.UTC).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    assert last_received_values[0] == expected1
 
     create_alert(
         None,
@@ -902,21 +765,12 @@ def test_full_deduplication_last_received(db_session, create_alert):
     )
 
     assert db_session.query(Alert).count() == 1
-    alerts = get_last_alerts(SINGLE_TENANT_UUID)
-    alerts_dto = convert_db_alerts_to_dto_alerts(alerts)
+    last_received_values = _last_received_values(db_session)
 
-    assert alerts_dto[0].lastReceived == dt2.astimezone(pytz.UTC).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    assert last_received_values[0] == expected2
 
 
-@pytest.mark.parametrize(
-    "test_app",
-    [
-        {
-            "AUTH_TYPE": "NOAUTH",
-        },
-    ],
-    indirect=True,
-)
+@noauth_test_app
 def test_sort_keys_deduplication_fix(db_session, client, test_app):
     """
     Test that alerts with same content but different key ordering are properly deduplicated.
@@ -938,22 +792,10 @@ def test_sort_keys_deduplication_fix(db_session, client, test_app):
     fingerprint_src = json.dumps(base_labels, sort_keys=True)
     fingerprint = hashlib.md5(fingerprint_src.encode()).hexdigest()
 
-    base_alert = {
-        "summary": "Test summary",
-        "labels": base_labels,
-        "annotations": {
-            "runbook": "http://example.com",
-            "description": "Test description"
-        },
-        "generatorURL": "http://prometheus:9090/graph",
-        "startsAt": datetime.now(tz=timezone.utc).isoformat(),
-        "endsAt": "0001-01-01T00:00:00Z",
-        "status": "firing",
-        "fingerprint": fingerprint
-    }
-
-    # Create the same alert but with different key ordering in nested objects
-    # This should still be considered the same alert and deduplicated
+    # Create the same alert but with different key ordering in the labels -
+    # it should still be considered the same alert and deduplicated. Both
+    # payloads share the template and a single startsAt so the key order is
+    # the *only* difference between them.
     reordered_labels = {
         "priority": "high",  # different order
         "env": "production",
@@ -961,59 +803,35 @@ def test_sort_keys_deduplication_fix(db_session, client, test_app):
         "team": "backend"
     }
 
-    # Same fingerprint since label content is identical
+    now = datetime.now(tz=timezone.utc).isoformat()
+    base_alert = {
+        **_PROMETHEUS_ALERT_TEMPLATE,
+        "labels": base_labels,
+        "startsAt": now,
+        "fingerprint": fingerprint,
+    }
     reordered_alert = {
-        "summary": "Test summary",
+        **_PROMETHEUS_ALERT_TEMPLATE,
         "labels": reordered_labels,
-        "generatorURL": "http://prometheus:9090/graph",  # different position
-        "annotations": {
-            "runbook": "http://example.com",
-            "description": "Test description"
-        },
-        "startsAt": datetime.now(tz=timezone.utc).isoformat(),
-        "endsAt": "0001-01-01T00:00:00Z",
-        "status": "firing",
-        "fingerprint": fingerprint  # Same fingerprint
+        "startsAt": now,
+        "fingerprint": fingerprint,  # same fingerprint, same label content
     }
 
-    # Send both alerts to prometheus provider
-    client.post(
-        "/alerts/event/prometheus",
-        json=base_alert,
-        headers={"x-api-key": "some-api-key"}
-    )
-    time.sleep(0.1)
+    # Send both alerts to the prometheus provider in a single bulk request -
+    # the worker still processes them in order, so the second one dedups
+    # against the first exactly as with two sequential posts
+    _bulk_post_events(client, "prometheus", [base_alert, reordered_alert])
 
-    client.post(
-        "/alerts/event/prometheus",
-        json=reordered_alert,
-        headers={"x-api-key": "some-api-key"}
-    )
-    time.sleep(0.1)
-
-    # Should only have 1 alert because they should be deduplicated
-    wait_for_alerts(client, 1)
+    # Check deduplication rules to verify deduplication occurred, waiting for
+    # the ratio to be calculated - 50% also implies only 1 alert was stored
+    deduplication_rules = wait_for_dedup_rules(client, dedup_ratio=50.0)
 
-    # Check deduplication rules to verify deduplication occurred
-    deduplication_rules = client.get(
-        "/deduplications", headers={"x-api-key": "some-api-key"}
-    ).json()
-
-    # Wait for deduplication ratio to be calculated
-    while not any(
-        [rule for rule in deduplication_rules if rule.get("dedup_ratio", 0) > 0]
-    ):
-        time.sleep(0.1)
-        deduplication_rules = client.get(
-            "/deduplications", headers={"x-api-key": "some-api-key"}
-        ).json()
-
-    # Find the prometheus deduplication rule
-    prometheus_rule = None
-    for rule in deduplication_rules:
-        if rule.get("provider_type") == "prometheus" and rule.get("default"):
-            prometheus_rule = rule
-            break
+    # Index the rules once instead of scanning for the prometheus default rule
+    rules_by_key = {
+        (rule.get("provider_type"), bool(rule.get("default"))): rule
+        for rule in deduplication_rules
+    }
+    prometheus_rule = rules_by_key.get(("prometheus", True))
 
     assert prometheus_rule is not None
     assert prometheus_rule.get("ingested") == 2
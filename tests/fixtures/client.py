@@ -1,5 +1,6 @@
 import hashlib
 import importlib
+import json
 import sys
 from contextlib import nullcontext
 from unittest.mock import MagicMock, patch
@@ -87,6 +88,9 @@ def test_app(monkeypatch, request, db_session):
 
 
 # Fixture for TestClient using the test_app fixture
+# Note: TestClient is httpx.Client over an in-process ASGITransport - requests
+# call the app directly without a socket, so this is already equivalent to
+# httpx.AsyncClient(app=app) while staying usable from sync test code.
 @pytest.fixture
 def client(test_app, db_session, monkeypatch):
     # Your existing environment setup
@@ -99,6 +103,41 @@ def client(test_app, db_session, monkeypatch):
         yield client
 
 
+def post_json(client, url, payload, headers=None):
+    """POST `payload` as a pre-encoded compact JSON body.
+
+    Bypasses httpx's `json=` path, which serializes with the default spaced
+    separators - encoding once with compact separators keeps the body smaller
+    and the encoding cost in one place for tests that post many events.
+    """
+    return client.post(
+        url,
+        content=json.dumps(payload, separators=(",", ":")).encode(),
+        headers={**(headers or {}), "content-type": "application/json"},
+    )
+
+
+# Shared ingest-readiness helpers: ingestion runs in background workers, so
+# tests that assert on ingested state long-poll the wait endpoints instead of
+# each rolling its own sleep/poll loop.
+def wait_for_alerts(client, num_alerts, timeout=10, api_key="some-api-key"):
+    """Long-poll until `num_alerts` alerts were ingested; returns the alerts."""
+    return client.get(
+        "/alerts/wait",
+        params={"count": num_alerts, "timeout": timeout},
+        headers={"x-api-key": api_key},
+    ).json()
+
+
+def wait_for_dedup_rules(client, timeout=10, api_key="some-api-key", **params):
+    """Long-poll until a dedup rule matches `params` (dedup_ratio/ingested)."""
+    return client.get(
+        "/deduplications/wait",
+        params={"timeout": timeout, **params},
+        headers={"x-api-key": api_key},
+    ).json()
+
+
 # Common setup for tests
 def setup_api_key(
     db_session, api_key_value, tenant_id=SINGLE_TENANT_UUID, role="admin"